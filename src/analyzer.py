@@ -3,183 +3,246 @@ System state analysis and health monitoring for NeuroCircuit
 Provides health scoring, visual indicators, and comparative analysis
 """
 
-from typing import Dict, Any
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Any, Sequence, Tuple
+import numpy as np
 from ..models.data_models import SystemMetrics
 from ..utils.colors import Colors
 
-class SystemStateAnalyzer:
-    """Analyzes system state and provides health metrics"""
+# Health weights in metric order: integrity, confidence, coordination,
+# throughput, latency (normalized), error rate (normalized)
+_WEIGHTS = np.array([0.25, 0.20, 0.20, 0.15, 0.10, 0.10], dtype=np.float64)
+_WEIGHT_VALUES = tuple(_WEIGHTS.tolist())
+_METRIC_FIELDS = ('system_integrity', 'agent_confidence', 'coordination_efficiency',
+                  'message_throughput', 'response_latency', 'error_rate')
+# Direction of improvement per metric (latency and error rate improve downwards)
+_RECOVERY_SIGNS = (1, 1, 1, 1, -1, -1)
+
+# Ascending score thresholds; _rating_index(thresholds, score) indexes the tables
+_HEALTH_THRESHOLDS = (50, 70, 85, 95)
+_HEALTH_COLORS = (Colors.BRIGHT_RED, Colors.BRIGHT_YELLOW, Colors.YELLOW, Colors.GREEN, Colors.BRIGHT_GREEN)
+_HEALTH_STATUS = ("Critical", "Poor", "Fair", "Good", "Excellent")
+_RESILIENCE_THRESHOLDS = (0.90, 0.95, 0.98)
+_RESILIENCE_LABELS = ("Poor", "Adequate", "Good", "Excellent")
+
+# Batches at least this large use the numba kernel when numba is installed. Importing
+# and loading it costs ~0.25s, and it saves ~50ns per row over NumPy.
+_JIT_MIN_ROWS = 5_000_000
+_jit_kernel = None  # compiled on first large batch; False when numba is unavailable
+
+def _metric_values(metrics: SystemMetrics) -> Tuple[float, ...]:
+    """Raw metric values in _METRIC_FIELDS order"""
+    return (metrics.system_integrity, metrics.agent_confidence, metrics.coordination_efficiency,
+            metrics.message_throughput, metrics.response_latency, metrics.error_rate)
+
+@lru_cache(maxsize=256)
+def _score(values: Tuple[float, ...]) -> float:
+    """Weighted health score for a metric value tuple (memoized by value)"""
+    integrity, confidence, coordination, throughput, latency, error_rate = values
+    w_integrity, w_confidence, w_coordination, w_throughput, w_latency, w_error = _WEIGHT_VALUES
     
-    @staticmethod
-    def calculate_health_score(metrics: SystemMetrics) -> float:
-        """Calculate overall system health score (0-100)"""
-        weights = {
-            'system_integrity': 0.25,
-            'agent_confidence': 0.20,
-            'coordination_efficiency': 0.20,
-            'message_throughput': 0.15,
-            'response_latency': 0.10,
-            'error_rate': 0.10
-        }
-        
-        # Normalize latency and error rate (lower is better)
-        normalized_latency = max(0, 100 - (metrics.response_latency / 10))
-        normalized_error_rate = max(0, 100 - (metrics.error_rate * 100))
-        
-        score = (
-            metrics.system_integrity * weights['system_integrity'] +
-            metrics.agent_confidence * weights['agent_confidence'] +
-            metrics.coordination_efficiency * weights['coordination_efficiency'] +
-            metrics.message_throughput * weights['message_throughput'] +
-            normalized_latency * weights['response_latency'] +
-            normalized_error_rate * weights['error_rate']
-        )
-        
-        return round(score, 2)
+    # Normalize latency and error rate (lower is better)
+    normalized_latency = max(0, 100 - (latency / 10))
+    normalized_error_rate = max(0, 100 - (error_rate * 100))
     
-    @staticmethod
-    def get_health_color(score: float) -> str:
-        """Get color code based on health score"""
-        c = Colors
-        if score >= 95:
-            return c.BRIGHT_GREEN
-        elif score >= 85:
-            return c.GREEN
-        elif score >= 70:
-            return c.YELLOW
-        elif score >= 50:
-            return c.BRIGHT_YELLOW
-        else:
-            return c.BRIGHT_RED
+    score = (
+        integrity * w_integrity +
+        confidence * w_confidence +
+        coordination * w_coordination +
+        throughput * w_throughput +
+        normalized_latency * w_latency +
+        normalized_error_rate * w_error
+    )
     
-    @staticmethod
-    def get_health_status(score: float) -> str:
-        """Get textual health status"""
-        if score >= 95:
-            return "Excellent"
-        elif score >= 85:
-            return "Good"
-        elif score >= 70:
-            return "Fair"
-        elif score >= 50:
-            return "Poor"
+    return round(score, 2)
+
+def _score_rows(values: np.ndarray) -> np.ndarray:
+    """Weighted health scores for raw (N, 6) metric rows, normalized in the same loop (numba kernel)"""
+    out = np.empty(values.shape[0])
+    for i in range(values.shape[0]):
+        # Clamp like np.maximum(0.0, x), which keeps NaN (builtin max would drop it)
+        normalized_latency = 100.0 - values[i, 4] / 10.0
+        if normalized_latency < 0.0:
+            normalized_latency = 0.0
+        normalized_error_rate = 100.0 - values[i, 5] * 100.0
+        if normalized_error_rate < 0.0:
+            normalized_error_rate = 0.0
+        out[i] = (values[i, 0] * _WEIGHTS[0] + values[i, 1] * _WEIGHTS[1] +
+                  values[i, 2] * _WEIGHTS[2] + values[i, 3] * _WEIGHTS[3] +
+                  normalized_latency * _WEIGHTS[4] + normalized_error_rate * _WEIGHTS[5])
+    return out
+
+def _get_jit_kernel():
+    """Compile _score_rows with numba on first use; False if numba is unavailable or fails"""
+    global _jit_kernel
+    if _jit_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # optional; batch scoring stays on NumPy
+            _jit_kernel = False
         else:
-            return "Critical"
+            # No fastmath: it lets LLVM assume there is no NaN/inf, and results must match NumPy
+            kernel = njit(cache=True)(_score_rows)
+            try:
+                kernel(np.zeros((1, 6)))  # compile now so a numba failure falls back to NumPy
+            except Exception:
+                kernel = False
+            _jit_kernel = kernel
+    return _jit_kernel
+
+def _score_batch(values: np.ndarray) -> np.ndarray:
+    """Weighted health scores for raw (N, 6) metric rows (normalizes in place)"""
+    if values.shape[0] >= _JIT_MIN_ROWS:
+        kernel = _get_jit_kernel()
+        if kernel:
+            return kernel(values)
     
-    @staticmethod
-    def create_visual_bar(value: float, max_value: float = 100, width: int = 20, 
-                         show_percentage: bool = True) -> str:
-        """Create a visual progress bar"""
-        if max_value == 0:
-            percentage = 0
-        else:
-            percentage = min(100, (value / max_value) * 100)
-        
-        filled = int((percentage / 100) * width)
-        empty = width - filled
-        
-        bar = "█" * filled + "░" * empty
-        
-        if show_percentage:
-            return f"{bar} {percentage:.1f}%"
-        else:
-            return bar
+    # Normalize latency and error rate (lower is better)
+    values[:, 4] = np.maximum(0.0, 100 - values[:, 4] / 10)
+    values[:, 5] = np.maximum(0.0, 100 - values[:, 5] * 100)
+    return values @ _WEIGHTS
+
+def _rating_index(thresholds: Tuple[float, ...], value: float) -> int:
+    """Index into a rating table for value; NaN falls to the lowest rating"""
+    return bisect_right(thresholds, value) if value == value else 0
+
+@lru_cache(maxsize=None)
+def _bar(filled: int, width: int) -> str:
+    """Progress bar string with `filled` of `width` cells filled"""
+    return "█" * filled + "░" * (width - filled)
+
+def calculate_health_score(metrics: SystemMetrics) -> float:
+    """Calculate overall system health score (0-100)"""
+    return _score(_metric_values(metrics))
+
+def calculate_health_score_batch(metrics_list: Sequence[SystemMetrics]) -> np.ndarray:
+    """Calculate health scores (0-100) for many metric snapshots in one pass"""
+    values = np.array([_metric_values(m) for m in metrics_list],
+                      dtype=np.float64).reshape(-1, 6)
+    return _score_batch(values).round(2)
+
+def get_health_color(score: float) -> str:
+    """Get color code based on health score"""
+    return _HEALTH_COLORS[_rating_index(_HEALTH_THRESHOLDS, score)]
+
+def get_health_status(score: float) -> str:
+    """Get textual health status"""
+    return _HEALTH_STATUS[_rating_index(_HEALTH_THRESHOLDS, score)]
+
+def create_visual_bar(value: float, max_value: float = 100, width: int = 20, 
+                     show_percentage: bool = True) -> str:
+    """Create a visual progress bar"""
+    if max_value == 0:
+        percentage = 0
+    else:
+        percentage = min(100, (value / max_value) * 100)
     
-    @staticmethod
-    def compare_states(before: SystemMetrics, after: SystemMetrics) -> Dict[str, Any]:
-        """Compare before and after system states"""
-        before_score = SystemStateAnalyzer.calculate_health_score(before)
-        after_score = SystemStateAnalyzer.calculate_health_score(after)
-        
-        metrics_comparison = {}
-        metric_fields = ['system_integrity', 'agent_confidence', 'coordination_efficiency', 
-                        'message_throughput', 'response_latency', 'error_rate']
-        
-        for field in metric_fields:
-            before_val = getattr(before, field)
-            after_val = getattr(after, field)
-            change = after_val - before_val
-            change_percent = (change / before_val * 100) if before_val != 0 else 0
-            
-            metrics_comparison[field] = {
-                'before': before_val,
-                'after': after_val,
-                'change': round(change, 3),
-                'change_percent': round(change_percent, 2)
-            }
-        
-        # Determine most impacted and best recovery metrics
-        most_impacted = max(metrics_comparison.items(), 
-                           key=lambda x: abs(x[1]['change_percent']))[0]
-        
-        best_recovery = max(metrics_comparison.items(),
-                           key=lambda x: x[1]['change'] if 'latency' not in x[0] 
-                           and 'error' not in x[0] else -x[1]['change'])[0]
-        
-        return {
-            'overall_health': {
-                'before_score': before_score,
-                'after_score': after_score,
-                'change': round(after_score - before_score, 2),
-                'recovery_success': after_score >= (before_score * 0.95)
-            },
-            'metrics_comparison': metrics_comparison,
-            'analysis_summary': {
-                'most_impacted_metric': most_impacted,
-                'best_recovery_metric': best_recovery,
-                'resilience_rating': SystemStateAnalyzer._get_resilience_rating(before_score, after_score)
-            }
+    bar = _bar(int((percentage / 100) * width), width)
+    
+    if show_percentage:
+        return f"{bar} {percentage:.1f}%"
+    else:
+        return bar
+
+def compare_states(before: SystemMetrics, after: SystemMetrics) -> Dict[str, Any]:
+    """Compare before and after system states"""
+    before_score = calculate_health_score(before)
+    after_score = calculate_health_score(after)
+    
+    # Six fixed fields: a plain loop beats building NumPy arrays here
+    metrics_comparison = {}
+    changes = []
+    change_percents = []
+    for field, before_val, after_val in zip(_METRIC_FIELDS, _metric_values(before), _metric_values(after)):
+        change = after_val - before_val
+        change_percent = (change / before_val * 100) if before_val != 0 else 0
+        changes.append(change)
+        change_percents.append(change_percent)
+        
+        # Rounded here: the comparison may be logged as JSON, not only displayed
+        metrics_comparison[field] = {
+            'before': before_val,
+            'after': after_val,
+            'change': round(change, 3),
+            'change_percent': round(change_percent, 2)
         }
     
-    @staticmethod
-    def _get_resilience_rating(before_score: float, after_score: float) -> str:
-        """Determine resilience rating based on recovery"""
-        recovery_ratio = after_score / before_score if before_score > 0 else 1
-        
-        if recovery_ratio >= 0.98:
-            return 'Excellent'
-        elif recovery_ratio >= 0.95:
-            return 'Good'
-        elif recovery_ratio >= 0.90:
-            return 'Adequate'
-        else:
-            return 'Poor'
+    # Determine most impacted and best recovery metrics (from full-precision values)
+    most_impacted = max(zip(change_percents, _METRIC_FIELDS),
+                        key=lambda item: abs(item[0]))[1]
+    best_recovery = max(zip(changes, _RECOVERY_SIGNS, _METRIC_FIELDS),
+                        key=lambda item: item[0] * item[1])[2]
     
-    @staticmethod
-    def analyze_agent_coordination(agents_before, agents_after) -> Dict[str, Any]:
-        """Analyze changes in agent coordination"""
-        coordination_analysis = {
-            'agents_improved': 0,
-            'agents_degraded': 0,
-            'average_confidence_change': 0,
-            'coordination_changes': []
+    return {
+        'overall_health': {
+            'before_score': before_score,
+            'after_score': after_score,
+            'change': round(after_score - before_score, 2),
+            'recovery_success': after_score >= (before_score * 0.95)
+        },
+        'metrics_comparison': metrics_comparison,
+        'analysis_summary': {
+            'most_impacted_metric': most_impacted,
+            'best_recovery_metric': best_recovery,
+            'resilience_rating': _get_resilience_rating(before_score, after_score)
         }
-        
-        if len(agents_before) != len(agents_after):
-            return coordination_analysis
-        
-        confidence_changes = []
-        
-        for before, after in zip(agents_before, agents_after):
-            if before.agent_id == after.agent_id:
-                confidence_change = after.confidence - before.confidence
-                confidence_changes.append(confidence_change)
-                
-                coordination_analysis['coordination_changes'].append({
-                    'agent_id': before.agent_id,
-                    'confidence_change': round(confidence_change, 2),
-                    'state_before': before.state.value,
-                    'state_after': after.state.value
-                })
-                
-                if confidence_change > 0:
-                    coordination_analysis['agents_improved'] += 1
-                elif confidence_change < 0:
-                    coordination_analysis['agents_degraded'] += 1
-        
-        if confidence_changes:
-            coordination_analysis['average_confidence_change'] = round(
-                sum(confidence_changes) / len(confidence_changes), 2
-            )
-        
+    }
+
+def _get_resilience_rating(before_score: float, after_score: float) -> str:
+    """Determine resilience rating based on recovery"""
+    recovery_ratio = after_score / before_score if before_score > 0 else 1
+    return _RESILIENCE_LABELS[_rating_index(_RESILIENCE_THRESHOLDS, recovery_ratio)]
+
+def analyze_agent_coordination(agents_before, agents_after) -> Dict[str, Any]:
+    """Analyze changes in agent coordination"""
+    coordination_analysis = {
+        'agents_improved': 0,
+        'agents_degraded': 0,
+        'average_confidence_change': 0,
+        'coordination_changes': []
+    }
+    
+    if len(agents_before) != len(agents_after):
         return coordination_analysis
+    
+    # A plain loop: agent lists are small, so NumPy conversion costs more than it saves
+    confidence_changes = []
+    for before, after in zip(agents_before, agents_after):
+        if before.agent_id == after.agent_id:
+            confidence_change = after.confidence - before.confidence
+            confidence_changes.append(confidence_change)
+            
+            coordination_analysis['coordination_changes'].append({
+                'agent_id': before.agent_id,
+                'confidence_change': round(confidence_change, 2),
+                'state_before': before.state.value,
+                'state_after': after.state.value
+            })
+            
+            if confidence_change > 0:
+                coordination_analysis['agents_improved'] += 1
+            elif confidence_change < 0:
+                coordination_analysis['agents_degraded'] += 1
+    
+    if confidence_changes:
+        coordination_analysis['average_confidence_change'] = round(
+            sum(confidence_changes) / len(confidence_changes), 2
+        )
+    
+    return coordination_analysis
+
+class SystemStateAnalyzer:
+    """Analyzes system state and provides health metrics
+    
+    Thin namespace over the module-level functions, kept for existing callers.
+    """
+    
+    calculate_health_score = staticmethod(calculate_health_score)
+    calculate_health_score_batch = staticmethod(calculate_health_score_batch)
+    get_health_color = staticmethod(get_health_color)
+    get_health_status = staticmethod(get_health_status)
+    create_visual_bar = staticmethod(create_visual_bar)
+    compare_states = staticmethod(compare_states)
+    _get_resilience_rating = staticmethod(_get_resilience_rating)
+    analyze_agent_coordination = staticmethod(analyze_agent_coordination)
@@ -3,8 +3,10 @@ Side-by-side coordination display system
 Provides perfectly aligned visual coordination between agents
 """
 
-import random
-from typing import Dict, List, Any
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Mapping, Any
 from ..models.data_models import AgentStatus, SystemMetrics, CoordinationStep
 from ..core.analyzer import SystemStateAnalyzer
 
@@ -12,32 +14,100 @@ from ..core.analyzer import SystemStateAnalyzer
 LEFT_WIDTH = 50
 RIGHT_WIDTH = 65
 
+# Metric bars: one cell per 5%, indexed by filled cell count
+_BAR_WIDTH = 20
+_BARS = tuple("█" * f + "░" * (_BAR_WIDTH - f) for f in range(_BAR_WIDTH + 1))
+
+def _metric_bar(value: float) -> str:
+    """Bar for a 0-100 metric; out-of-range values clamp to an empty or full bar"""
+    return _BARS[max(0, min(_BAR_WIDTH, int(value / 5)))]
+
+# Coordination progress bars per Kotler step and fault recovery phase
+_KOTLER_PROGRESS_BARS: Mapping[str, str] = MappingProxyType({
+    "1/6": _BARS[4],
+    "2/6": _BARS[8],
+    "3/6": _BARS[12],
+    "4/6": _BARS[16],
+    "5/6": _BARS[20],
+    "6/6": _BARS[20]
+})
+_FAULT_PROGRESS_BARS: Mapping[int, str] = MappingProxyType({
+    1: _BARS[8],
+    2: _BARS[12],
+    3: _BARS[16],
+    4: _BARS[20]
+})
+
+# Box borders and column formatters, invariant across frames
+_LEFT_HR = '─' * (LEFT_WIDTH-2)
+_RIGHT_HR = '─' * (RIGHT_WIDTH-2)
+_TOP_BORDER = f"╭{_LEFT_HR}╮ ╭{_RIGHT_HR}╮"
+_BOTTOM_BORDER = f"╰{_LEFT_HR}╯ ╰{_RIGHT_HR}╯"
+_LPAD = f"│{{:<{LEFT_WIDTH-2}.{LEFT_WIDTH-2}}}│".format
+_RPAD = f"│{{:<{RIGHT_WIDTH-2}.{RIGHT_WIDTH-2}}}│".format
+# Indented cell text, truncated by format precision rather than slicing
+_ACTION_CELL = f"    {{:.{LEFT_WIDTH-6}}}".format
+_DETAIL_CELL = f" {{:.{RIGHT_WIDTH-4}}}".format
+
+# Kotler action text indexed by step number - 1, for the active agent
+# ({u} is the user name) and its target
+_KOTLER_ACTIVE_TEMPLATES = (
+    "Analyzing {u}'s flow state patterns",
+    "Routing {u}'s context to memory systems",
+    "Retrieving flow strategies for {u}",
+    "Optimizing {u}'s challenge-skill balance",
+    "Adapting flow parameters for {u}",
+    "Coordinating {u}'s flow completion"
+)
+_KOTLER_TARGET_TEMPLATES = (
+    "Receiving flow analysis data",
+    "Processing context preservation request",
+    "Preparing strategy pattern delivery",
+    "Ready for optimization plan execution",
+    "Coordinating system-wide flow adjustment",
+    "Confirming flow recovery completion"
+)
+# Exact step keys ("1/6".."6/6") to template index; any other step text has no template
+_KOTLER_STEP_INDEX: Mapping[str, int] = MappingProxyType(
+    {f"{n}/6": n - 1 for n in range(1, len(_KOTLER_ACTIVE_TEMPLATES) + 1)})
+
+@lru_cache(maxsize=512)
 def pad_left(text: str) -> str:
     """Pad text to exactly LEFT_WIDTH characters"""
-    return f"│{text[:LEFT_WIDTH-2]:<{LEFT_WIDTH-2}}│"
+    return _LPAD(text)
 
+@lru_cache(maxsize=512)
 def pad_right(text: str) -> str:
     """Pad text to exactly RIGHT_WIDTH characters"""
-    return f"│{text[:RIGHT_WIDTH-2]:<{RIGHT_WIDTH-2}}│"
+    return _RPAD(text)
+
+def _write_rows(rows: List[str]):
+    """Emit a rendered frame with a single write"""
+    sys.stdout.write("\n".join(rows))
+    sys.stdout.write("\n")
+    sys.stdout.flush()
 
-def display_side_by_side_kotler_coordination(step_data: CoordinationStep, user_name: str, agents: List[str]):
+def display_side_by_side_kotler_coordination(step_data: CoordinationStep, user_name: str, agents: List[str],
+                                             metrics: SystemMetrics):
     """Display the beautiful side-by-side Kotler coordination"""
     
+    rows: List[str] = []
+    
     # Header row
     left_header = pad_left(" 🤖 Agent Coordination Actions")
     right_header = pad_right(f" 🤖 LIVE AGENT COORDINATION - Step {step_data.step}")
-    print(f"╭{'─' * (LEFT_WIDTH-2)}╮ ╭{'─' * (RIGHT_WIDTH-2)}╮")
-    print(f"{left_header} {right_header}")
+    rows.append(_TOP_BORDER)
+    rows.append(f"{left_header} {right_header}")
     
     # Second row
     left_coord = pad_left(" 🤖 LIVE AGENT COORDINATION:")
     right_empty = pad_right("")
-    print(f"{left_coord} {right_empty}")
+    rows.append(f"{left_coord} {right_empty}")
     
     # Third row - step description
     left_empty = pad_left("")
     right_desc = pad_right(f" {step_data.description}")
-    print(f"{left_empty} {right_desc}")
+    rows.append(f"{left_empty} {right_desc}")
     
     # Show each agent's status and actions
     for i, agent in enumerate(agents):
@@ -45,7 +115,8 @@ def display_side_by_side_kotler_coordination(step_data: CoordinationStep, user_n
         status = "← ACTIVE" if agent == step_data.active else "← TARGET" if agent == step_data.target else ""
         
         # Generate agent actions based on step and role
-        action = _generate_kotler_action(step_data, agent, user_name)
+        action = _generate_kotler_action(step_data.step, user_name,
+                                         agent == step_data.active, agent == step_data.target)
         
         # Left column: Agent name and status
         left_agent = pad_left(f" {state_icon} {agent}:{' ' * (25 - len(agent))}{status}")
@@ -53,22 +124,23 @@ def display_side_by_side_kotler_coordination(step_data: CoordinationStep, user_n
         # Right column content varies by row
         right_content = _get_kotler_right_content(i, step_data, user_name)
         
-        print(f"{left_agent} {right_content}")
+        rows.append(f"{left_agent} {right_content}")
         
         # Left column: Agent action (indented)
-        left_action = pad_left(f"    {action[:LEFT_WIDTH-6]}")
+        left_action = pad_left(_ACTION_CELL(action))
         
         # Right column content for second row of each agent
-        right_content2 = _get_kotler_right_content_second_row(i, step_data)
+        right_content2 = _get_kotler_right_content_second_row(i, step_data, metrics)
         
-        print(f"{left_action} {right_content2}")
+        rows.append(f"{left_action} {right_content2}")
     
     # Footer
-    print(f"╰{'─' * (LEFT_WIDTH-2)}╯ ╰{'─' * (RIGHT_WIDTH-2)}╯")
+    rows.append(_BOTTOM_BORDER)
     
     # Show live coordination message
-    print(f"────────── 🔴 LIVE: {step_data.active} ═══▶ {step_data.target} (with {user_name}'s data) ──────────")
-    print()
+    rows.append(f"────────── 🔴 LIVE: {step_data.active} ═══▶ {step_data.target} (with {user_name}'s data) ──────────")
+    rows.append("")
+    _write_rows(rows)
 
 def display_side_by_side_fault_injection(agents: List[AgentStatus], target_agent: str, 
                                         phase: int, metrics: SystemMetrics, user_name: str = "User"):
@@ -82,94 +154,77 @@ def display_side_by_side_fault_injection(agents: List[AgentStatus], target_agent
         4: f"✅ RECOVERY COMPLETE - All agents back in coordination"
     }
     
-    # Progress bars
-    progress_bars = {
-        1: "████████░░░░░░░░░░░░",
-        2: "████████████░░░░░░░░", 
-        3: "████████████████░░░░",
-        4: "████████████████████"
-    }
+    rows: List[str] = []
     
     # Header row
     left_header = pad_left(" 🤖 Agent Coordination Actions")
     right_header = pad_right(f" 🤖 LIVE FAULT RECOVERY - Step {phase}/4")
-    print(f"╭{'─' * (LEFT_WIDTH-2)}╮ ╭{'─' * (RIGHT_WIDTH-2)}╮")
-    print(f"{left_header} {right_header}")
+    rows.append(_TOP_BORDER)
+    rows.append(f"{left_header} {right_header}")
     
     # Second row
     left_coord = pad_left(" 🤖 LIVE AGENT COORDINATION:")
     right_empty = pad_right("")
-    print(f"{left_coord} {right_empty}")
+    rows.append(f"{left_coord} {right_empty}")
     
     # Third row
     left_empty = pad_left("")
-    right_desc = pad_right(f" {phase_descriptions[phase][:RIGHT_WIDTH-4]}")
-    print(f"{left_empty} {right_desc}")
+    right_desc = pad_right(_DETAIL_CELL(phase_descriptions[phase]))
+    rows.append(f"{left_empty} {right_desc}")
     
     # Show each agent's status and actions
     for i, agent in enumerate(agents):
         state_icon = agent.state.value
         
         # Generate fault-specific actions
-        action = _generate_fault_action(agent, target_agent, phase)
+        action = _generate_fault_action(agent.agent_id, target_agent, phase)
         
         # Left column: Agent name and status
         left_agent = pad_left(f" {state_icon} {agent.agent_id}:")
         
         # Right column content varies by row
-        right_content = _get_fault_right_content(i, phase, progress_bars, target_agent)
+        right_content = _get_fault_right_content(i, phase, target_agent)
         
-        print(f"{left_agent} {right_content}")
+        rows.append(f"{left_agent} {right_content}")
         
         # Left column: Agent action (indented)
-        left_action = pad_left(f"    {action[:LEFT_WIDTH-6]}")
+        left_action = pad_left(_ACTION_CELL(action))
         
         # Right column content for second row of each agent
         right_content2 = _get_fault_right_content_second_row(i, metrics, user_name)
         
-        print(f"{left_action} {right_content2}")
+        rows.append(f"{left_action} {right_content2}")
     
     # Footer
-    print(f"╰{'─' * (LEFT_WIDTH-2)}╯ ╰{'─' * (RIGHT_WIDTH-2)}╯")
+    rows.append(_BOTTOM_BORDER)
     
     # Show phase-specific messages
-    _display_fault_phase_message(phase, target_agent)
-    print()
+    rows.append(_get_fault_phase_message(phase, target_agent))
+    rows.append("")
+    _write_rows(rows)
 
-def _generate_kotler_action(step_data: CoordinationStep, agent: str, user_name: str) -> str:
+@lru_cache(maxsize=256)
+def _generate_kotler_action(step: str, user_name: str, is_active: bool, is_target: bool) -> str:
     """Generate action text for Kotler demo"""
-    if agent == step_data.active:
-        actions = {
-            "1/6": f"Analyzing {user_name}'s flow state patterns",
-            "2/6": f"Routing {user_name}'s context to memory systems",
-            "3/6": f"Retrieving flow strategies for {user_name}",
-            "4/6": f"Optimizing {user_name}'s challenge-skill balance",
-            "5/6": f"Adapting flow parameters for {user_name}",
-            "6/6": f"Coordinating {user_name}'s flow completion"
-        }
-        return actions.get(step_data.step, "Processing coordination")
-    elif agent == step_data.target:
-        actions = {
-            "1/6": "Receiving flow analysis data",
-            "2/6": "Processing context preservation request",
-            "3/6": "Preparing strategy pattern delivery",
-            "4/6": "Ready for optimization plan execution",
-            "5/6": "Coordinating system-wide flow adjustment",
-            "6/6": "Confirming flow recovery completion"
-        }
-        return actions.get(step_data.step, "Receiving coordination")
+    step_idx = _KOTLER_STEP_INDEX.get(step)
+    
+    if is_active:
+        return _KOTLER_ACTIVE_TEMPLATES[step_idx].format(u=user_name) if step_idx is not None else "Processing coordination"
+    elif is_target:
+        return _KOTLER_TARGET_TEMPLATES[step_idx] if step_idx is not None else "Receiving coordination"
     else:
         # Supporting agents
-        if step_data.step in ["1/6", "2/6"]:
+        if step in ["1/6", "2/6"]:
             return f"Supporting {user_name} context analysis"
-        elif step_data.step in ["3/6", "4/6"]:
+        elif step in ["3/6", "4/6"]:
             return f"Contributing to {user_name} flow optimization"
         else:
             return f"Validating {user_name} flow recovery success"
 
-def _generate_fault_action(agent: AgentStatus, target_agent: str, phase: int) -> str:
+@lru_cache(maxsize=256)
+def _generate_fault_action(agent_id: str, target_agent: str, phase: int) -> str:
     """Generate action text for fault injection"""
-    if agent.agent_id == target_agent and phase <= 2:
+    if agent_id == target_agent and phase <= 2:
         if phase == 1:
             return "FAULT DETECTED: Attempting self-recovery"
         else:
@@ -188,15 +243,7 @@ def _get_kotler_right_content(i: int, step_data: CoordinationStep, user_name: st
     if i == 0:  # First agent - show progress
         return pad_right(" Agent Coordination Progress:")
     elif i == 1:  # Second agent - show progress bar
-        progress_bars = {
-            "1/6": "████░░░░░░░░░░░░░░░░",
-            "2/6": "████████░░░░░░░░░░░░", 
-            "3/6": "████████████░░░░░░░░",
-            "4/6": "████████████████░░░░",
-            "5/6": "████████████████████",
-            "6/6": "████████████████████"
-        }
-        return pad_right(f" {progress_bars[step_data.step]} {step_data.step}")
+        return pad_right(f" {_KOTLER_PROGRESS_BARS[step_data.step]} {step_data.step}")
     elif i == 2:  # Third agent - show coordination analysis
         return pad_right(" Coordination Analysis:")
     elif i == 3:  # Fourth agent - show analysis details
@@ -206,13 +253,13 @@ def _get_kotler_right_content(i: int, step_data: CoordinationStep, user_name: st
             analysis_text = f"Strategy optimization: Improving {user_name}'s flow coefficient"
         else:
             analysis_text = f"SUCCESS: {user_name} achieved optimal flow state"
-        return pad_right(f" {analysis_text[:RIGHT_WIDTH-4]}")
+        return pad_right(_DETAIL_CELL(analysis_text))
     elif i == 4:  # Fifth agent - show metrics
         return pad_right(" System Recovery Metrics:")
     else:  # Sixth agent - show context preservation
         return pad_right(f" Context Preserved: ✅ {user_name}'s profile")
 
-def _get_kotler_right_content_second_row(i: int, step_data: CoordinationStep) -> str:
+def _get_kotler_right_content_second_row(i: int, step_data: CoordinationStep, metrics: SystemMetrics) -> str:
     """Get second row right column content for Kotler display"""
     if i == 1:  # After progress bar - show empty
         return pad_right("")
@@ -221,22 +268,20 @@ def _get_kotler_right_content_second_row(i: int, step_data: CoordinationStep) ->
     elif i == 3:  # After analysis details - show empty
         return pad_right("")
     elif i == 4:  # After metrics header - show system integrity
-        integrity_value = random.uniform(85, 99)
-        integrity_bar = "█" * int(integrity_value / 5) + "░" * (20 - int(integrity_value / 5))
-        return pad_right(f" System Integrity  {integrity_bar} {integrity_value:.1f}%")
+        integrity_bar = _metric_bar(metrics.system_integrity)
+        return pad_right(f" System Integrity  {integrity_bar} {metrics.system_integrity:.1f}%")
     elif i == 5:  # After context preservation - show confidence
-        confidence_value = random.uniform(80, 95)
-        confidence_bar = "█" * int(confidence_value / 5) + "░" * (20 - int(confidence_value / 5))
-        return pad_right(f" Agent Confidence  {confidence_bar} {confidence_value:.1f}%")
+        confidence_bar = _metric_bar(metrics.agent_confidence)
+        return pad_right(f" Agent Confidence  {confidence_bar} {metrics.agent_confidence:.1f}%")
     else:
         return pad_right("")
 
-def _get_fault_right_content(i: int, phase: int, progress_bars: Dict[int, str], target_agent: str) -> str:
+def _get_fault_right_content(i: int, phase: int, target_agent: str) -> str:
     """Get right column content for fault display"""
     if i == 0:  # First agent - show progress
         return pad_right(" Agent Coordination Progress:")
     elif i == 1:  # Second agent - show progress bar
-        return pad_right(f" {progress_bars[phase]} Step {phase}/4")
+        return pad_right(f" {_FAULT_PROGRESS_BARS[phase]} Step {phase}/4")
     elif i == 2:  # Third agent - show coordination analysis
         return pad_right(" Coordination Analysis:")
     elif i == 3:  # Fourth agent - show analysis details
@@ -248,7 +293,7 @@ def _get_fault_right_content(i: int, phase: int, progress_bars: Dict[int, str],
             analysis_text = f"Collaborative healing: All agents restoring {target_agent}"
         else:
             analysis_text = f"SUCCESS: {target_agent} fully recovered via coordination"
-        return pad_right(f" {analysis_text[:RIGHT_WIDTH-4]}")
+        return pad_right(_DETAIL_CELL(analysis_text))
     elif i == 4:  # Fifth agent - show metrics
         return pad_right(" System Recovery Metrics:")
     else:  # Sixth agent - show data protection
@@ -263,21 +308,21 @@ def _get_fault_right_content_second_row(i: int, metrics: SystemMetrics, user_nam
     elif i == 3:  # After analysis details - show empty
         return pad_right("")
     elif i == 4:  # After metrics header - show system integrity
-        integrity_bar = "█" * int(metrics.system_integrity / 5) + "░" * (20 - int(metrics.system_integrity / 5))
+        integrity_bar = _metric_bar(metrics.system_integrity)
         return pad_right(f" System Integrity  {integrity_bar} {metrics.system_integrity:.1f}%")
     elif i == 5:  # After data protection - show confidence
-        confidence_bar = "█" * int(metrics.agent_confidence / 5) + "░" * (20 - int(metrics.agent_confidence / 5))
+        confidence_bar = _metric_bar(metrics.agent_confidence)
         return pad_right(f" Agent Confidence  {confidence_bar} {metrics.agent_confidence:.1f}%")
     else:
         return pad_right("")
 
-def _display_fault_phase_message(phase: int, target_agent: str):
-    """Display phase-specific messages for fault injection"""
+def _get_fault_phase_message(phase: int, target_agent: str) -> str:
+    """Get phase-specific message for fault injection"""
     if phase == 1:
-        print("🚨 FAULT DETECTED: Agents initiating cross-coordination protocols!")
+        return "🚨 FAULT DETECTED: Agents initiating cross-coordination protocols!"
     elif phase == 2:
-        print(f"🤝 EMERGENCY COORDINATION: 5 agents collaborating to isolate {target_agent}!")
+        return f"🤝 EMERGENCY COORDINATION: 5 agents collaborating to isolate {target_agent}!"
     elif phase == 3:
-        print(f"🔄 COLLABORATIVE HEALING: All agents working together to restore {target_agent}!")
+        return f"🔄 COLLABORATIVE HEALING: All agents working together to restore {target_agent}!"
     else:
-        print(f"🎉 COORDINATION SUCCESS: {target_agent} restored through agent collaboration!")
+        return f"🎉 COORDINATION SUCCESS: {target_agent} restored through agent collaboration!"
@@ -3,74 +3,239 @@ Comprehensive logging system for NeuroCircuit
 Provides both JSON files and JSONL streaming for all events
 """
 
-import json
 import os
+import queue
+import threading
+import time
 import uuid
-import datetime
-from typing import Dict, List, Any
+import weakref
+import orjson
+from typing import Dict, List, Set, Any, Optional, Tuple
 from ..models.data_models import SystemMetrics, AgentStatus, FaultEvent, RecoveryStep
-from ..core.analyzer import SystemStateAnalyzer
+from ..core.analyzer import calculate_health_score
+from ..utils.timestamps import iso_now
+
+# Non-string keys and NumPy scalars are accepted, as callers may pass either in metadata
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# State files are compact JSON; set NEUROCIRCUIT_PRETTY_LOGS=1 for indented output
+PRETTY_LOGS = os.environ.get("NEUROCIRCUIT_PRETTY_LOGS") == "1"
+_STATE_FILE_OPTIONS = _JSON_OPTIONS | (orjson.OPT_INDENT_2 if PRETTY_LOGS else 0)
+
+# JSONL event fields per event type, in output order after event_type
+# (session_id is written by the per-session JSONL prefix)
+_EVENT_SCHEMAS = {
+    "session_start": ("timestamp",),
+    "system_state": ("state_type", "timestamp", "metadata", "health_score", "agent_count"),
+    "fault_injection": ("timestamp", "fault_type", "target_agent", "severity",
+                        "recovery_steps", "total_recovery_time_ms"),
+    "kotler_demo_complete": ("user_name", "timestamp", "final_flow", "effectiveness"),
+    "coordination_sequence": ("sequence_type", "timestamp", "step_count"),
+    "session_end": ("timestamp",)
+}
+
+# Buffer size for log file handles; typical state files go out in one write
+_WRITE_BUFFER_SIZE = 1 << 16
+
+# Most queued items the writer thread handles before flushing the streams it wrote to
+_WRITER_DRAIN_LIMIT = 64
+
+def _write_file(filename: str, data: bytes):
+    """Write encoded data to a new file through one large binary buffer"""
+    with open(filename, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(data)
+
+def _encode_event(jsonl_prefix: bytes, event: Dict[str, Any]) -> bytes:
+    """Encode one JSONL line; the per-session prefix supplies session_id"""
+    return jsonl_prefix + orjson.dumps(event, option=_JSON_OPTIONS)[1:] + b'\n'
+
+class _JSONLStream:
+    """An open events.jsonl handle and the first error the writer thread hit on it"""
+    
+    __slots__ = ("fp", "error")
+    
+    def __init__(self, fp):
+        self.fp = fp
+        self.error: Optional[Exception] = None
+
+# One writer thread serves every logger in the process. Queue items are
+# (stream, bytes) to append a line, (stream, None) to close the stream, or
+# (None, event) to set the event once everything queued before it is on disk.
+_write_queue: "queue.SimpleQueue[Tuple[Optional[_JSONLStream], Any]]" = queue.SimpleQueue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+def _start_writer():
+    """Start the shared writer thread on first use"""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_writer_loop, name="neurocircuit-log-writer", daemon=True)
+            _writer_thread.start()
+
+def _writer_loop():
+    """Write queued JSONL lines in batches, flushing each stream written to"""
+    while True:
+        items = [_write_queue.get()]
+        try:
+            while len(items) < _WRITER_DRAIN_LIMIT:
+                items.append(_write_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        pending: Dict[_JSONLStream, List[bytes]] = {}
+        closing = []
+        done = []
+        for stream, data in items:
+            if stream is None:
+                done.append(data)
+            elif data is None:
+                closing.append(stream)
+            else:
+                pending.setdefault(stream, []).append(data)
+        
+        for stream, lines in pending.items():
+            try:
+                stream.fp.write(b''.join(lines))
+                stream.fp.flush()
+            except Exception as e:
+                # Keep serving other items; the owning logger re-raises on its next call
+                if stream.error is None:
+                    stream.error = e
+        for stream in closing:
+            try:
+                stream.fp.close()
+            except Exception as e:
+                if stream.error is None:
+                    stream.error = e
+        for event in done:
+            event.set()
+
+def _wait_for_writer():
+    """Block until everything queued so far has been written and flushed"""
+    if _writer_thread is None or threading.current_thread() is _writer_thread:
+        return
+    done = threading.Event()
+    _write_queue.put((None, done))
+    done.wait()
+
+def _end_stream(stream: _JSONLStream, jsonl_prefix: bytes):
+    """Write session_end and close the stream; runs once, from finalize_session, GC or exit"""
+    _write_queue.put((stream, _encode_event(jsonl_prefix, {"event_type": "session_end", "timestamp": iso_now()})))
+    _write_queue.put((stream, None))
+    _wait_for_writer()
 
 class JSONLogger:
-    """Comprehensive logging system with both JSON files and JSONL streaming"""
+    """Comprehensive logging system with both JSON files and JSONL streaming
+    
+    JSONL events reach events.jsonl shortly after each log call, from a shared
+    background writer; call flush() before reading the stream file. Use
+    finalize_session() or a with-block to end the session.
+    """
+    
+    # Log directories (absolute paths) already created by this process
+    _dirs_created: Set[str] = set()
     
     def __init__(self, log_dir: str = "neurocircuit_logs"):
         self.log_dir = log_dir
-        os.makedirs(log_dir, exist_ok=True)
+        self._ensure_log_dir()
         self.session_id = str(uuid.uuid4())[:8]
-        self.session_start = datetime.datetime.now().isoformat()
+        self.session_start = iso_now()
         
-        # Initialize JSONL stream file
+        # Session files share one timestamped prefix; a counter keeps names unique and ordered
+        self._session_prefix = os.path.join(log_dir, f"{time.strftime('%Y%m%d_%H%M%S')}_{self.session_id}_")
+        self._file_seq = 0
+        
+        # Initialize JSONL stream file, kept open for the whole session
         self.jsonl_file = self._create_session_file("events.jsonl")
-        self._log_jsonl_event({
-            "event_type": "session_start",
-            "session_id": self.session_id,
-            "timestamp": self.session_start
-        })
+        # O_APPEND keeps each write() at end-of-file without reopening per event
+        jsonl_flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        try:
+            jsonl_fd = os.open(self.jsonl_file, jsonl_flags, 0o644)
+        except FileNotFoundError:
+            # Directory was removed since it was cached as created; recreate and retry
+            self._ensure_log_dir(force=True)
+            jsonl_fd = os.open(self.jsonl_file, jsonl_flags, 0o644)
+        self._stream = _JSONLStream(os.fdopen(jsonl_fd, 'ab', buffering=_WRITE_BUFFER_SIZE))
+        # Every event starts with the same session_id field: encode it once as '{"session_id":"...",'
+        self._jsonl_prefix = orjson.dumps({"session_id": self.session_id})[:-1] + b','
+        
+        # JSONL lines go to the shared writer thread; log calls only enqueue encoded bytes.
+        # State files stay synchronous so the returned path exists when a log_* call returns.
+        _start_writer()
+        # Ends the session on finalize_session(), garbage collection or interpreter exit,
+        # without the strong reference a bound-method atexit entry would keep
+        self._finalizer = weakref.finalize(self, _end_stream, self._stream, self._jsonl_prefix)
         
+        self._emit("session_start", timestamp=self.session_start)
+        
+    def _ensure_log_dir(self, force: bool = False):
+        """Create the log directory unless this process already has"""
+        log_dir = os.path.abspath(self.log_dir)
+        if force or log_dir not in JSONLogger._dirs_created:
+            os.makedirs(log_dir, exist_ok=True)
+            JSONLogger._dirs_created.add(log_dir)
+    
     def _create_session_file(self, filename: str) -> str:
-        """Create timestamped session file"""
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        return os.path.join(self.log_dir, f"{timestamp}_{self.session_id}_{filename}")
+        """Create session file path, numbered in creation order"""
+        self._file_seq += 1
+        return f"{self._session_prefix}{self._file_seq:03d}_{filename}"
+    
+    def _emit(self, event_type: str, **fields):
+        """Log a JSONL event built from the fields listed in its _EVENT_SCHEMAS entry"""
+        event = {"event_type": event_type}
+        for key in _EVENT_SCHEMAS[event_type]:
+            event[key] = fields[key]
+        self._log_jsonl_event(event)
     
     def _log_jsonl_event(self, event: Dict[str, Any]):
-        """Append event to JSONL stream file"""
-        with open(self.jsonl_file, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        """Queue event for the JSONL stream file; session_id is added by the prefix"""
+        line = _encode_event(self._jsonl_prefix, event)
+        if self._finalizer.alive:
+            _write_queue.put((self._stream, line))
+        else:
+            # The session's stream is closed; append directly so late events are not lost
+            with open(self.jsonl_file, 'ab') as f:
+                f.write(line)
+    
+    def _raise_write_error(self):
+        """Re-raise a failure recorded by the writer thread, once"""
+        error = self._stream.error
+        if error is not None:
+            self._stream.error = None
+            raise error
     
     def log_system_state(self, state_type: str, metrics: SystemMetrics, 
                         agents: List[AgentStatus], metadata: Dict[str, Any] = None) -> str:
         """Log complete system state to both JSON file and JSONL stream"""
+        self._raise_write_error()
+        timestamp = iso_now()
         
         # Create JSON file
         filename = self._create_session_file(f"{state_type}_state.json")
         state_data = {
             "session_id": self.session_id,
             "state_type": state_type,
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": timestamp,
             "system_metrics": metrics.to_dict(),
             "agents": [agent.to_dict() for agent in agents],
             "metadata": metadata or {}
         }
         
-        with open(filename, 'w') as f:
-            json.dump(state_data, f, indent=2)
+        _write_file(filename, orjson.dumps(state_data, option=_STATE_FILE_OPTIONS))
         
         # Add to JSONL stream
-        self._log_jsonl_event({
-            "event_type": "system_state",
-            "session_id": self.session_id,
-            "state_type": state_type,
-            "timestamp": datetime.datetime.now().isoformat(),
-            "health_score": SystemStateAnalyzer.calculate_health_score(metrics),
-            "agent_count": len(agents),
-            "metadata": metadata or {}
-        })
+        self._emit("system_state", **state_data,
+                   health_score=calculate_health_score(metrics),
+                   agent_count=len(agents))
         
         return filename
     
     def log_fault_event(self, fault: FaultEvent, recovery_steps: List[RecoveryStep]) -> str:
         """Log complete fault injection event to both JSON file and JSONL stream"""
+        self._raise_write_error()
+        timestamp = iso_now()
+        total_recovery_time = sum(step.duration_ms for step in recovery_steps)
         
         # Create JSON file
         filename = self._create_session_file("fault_event.json")
@@ -78,86 +243,81 @@ class JSONLogger:
             "session_id": self.session_id,
             "fault_event": fault.to_dict(),
             "recovery_process": [step.to_dict() for step in recovery_steps],
-            "total_recovery_time": sum(step.duration_ms for step in recovery_steps),
-            "timestamp": datetime.datetime.now().isoformat()
+            "total_recovery_time": total_recovery_time,
+            "timestamp": timestamp
         }
         
-        with open(filename, 'w') as f:
-            json.dump(event_data, f, indent=2)
+        _write_file(filename, orjson.dumps(event_data, option=_STATE_FILE_OPTIONS))
         
         # Add to JSONL stream
-        self._log_jsonl_event({
-            "event_type": "fault_injection",
-            "session_id": self.session_id,
-            "fault_type": fault.fault_type.value,
-            "target_agent": fault.target_agent,
-            "severity": fault.severity,
-            "recovery_steps": len(recovery_steps),
-            "total_recovery_time_ms": sum(step.duration_ms for step in recovery_steps),
-            "timestamp": datetime.datetime.now().isoformat()
-        })
+        self._emit("fault_injection", **event_data,
+                   fault_type=fault.fault_type.value,
+                   target_agent=fault.target_agent,
+                   severity=fault.severity,
+                   recovery_steps=len(recovery_steps),
+                   total_recovery_time_ms=total_recovery_time)
         
         return filename
     
     def log_kotler_demo(self, user_name: str, flow_data: Dict[str, Any]) -> str:
         """Log Kotler demo session"""
+        self._raise_write_error()
+        timestamp = iso_now()
         filename = self._create_session_file("kotler_demo.json")
         demo_data = {
             "session_id": self.session_id,
             "user_name": user_name,
             "flow_data": flow_data,
-            "timestamp": datetime.datetime.now().isoformat()
+            "timestamp": timestamp
         }
         
-        with open(filename, 'w') as f:
-            json.dump(demo_data, f, indent=2)
+        _write_file(filename, orjson.dumps(demo_data, option=_STATE_FILE_OPTIONS))
         
-        self._log_jsonl_event({
-            "event_type": "kotler_demo_complete",
-            "session_id": self.session_id,
-            "user_name": user_name,
-            "final_flow": flow_data.get('target_flow', 0),
-            "effectiveness": flow_data.get('effectiveness', 0),
-            "timestamp": datetime.datetime.now().isoformat()
-        })
+        self._emit("kotler_demo_complete", **demo_data,
+                   final_flow=flow_data.get('target_flow', 0),
+                   effectiveness=flow_data.get('effectiveness', 0))
         
         return filename
     
     def log_coordination_sequence(self, sequence_type: str, steps: List[Dict[str, Any]], 
                                  user_context: Dict[str, Any] = None) -> str:
         """Log agent coordination sequence"""
+        self._raise_write_error()
+        timestamp = iso_now()
         filename = self._create_session_file(f"{sequence_type}_coordination.json")
         sequence_data = {
             "session_id": self.session_id,
             "sequence_type": sequence_type,
             "steps": steps,
             "user_context": user_context or {},
-            "timestamp": datetime.datetime.now().isoformat()
+            "timestamp": timestamp
         }
         
-        with open(filename, 'w') as f:
-            json.dump(sequence_data, f, indent=2)
+        _write_file(filename, orjson.dumps(sequence_data, option=_STATE_FILE_OPTIONS))
         
-        self._log_jsonl_event({
-            "event_type": "coordination_sequence",
-            "session_id": self.session_id,
-            "sequence_type": sequence_type,
-            "step_count": len(steps),
-            "timestamp": datetime.datetime.now().isoformat()
-        })
+        self._emit("coordination_sequence", **sequence_data, step_count=len(steps))
         
         return filename
     
+    def flush(self):
+        """Wait until every event logged so far is written to the JSONL stream file"""
+        _wait_for_writer()
+        self._raise_write_error()
+    
     def finalize_session(self):
-        """Close session with final JSONL event"""
-        self._log_jsonl_event({
-            "event_type": "session_end",
-            "session_id": self.session_id,
-            "timestamp": datetime.datetime.now().isoformat()
-        })
+        """Close session with final JSONL event and wait until it is written"""
+        if self._finalizer.alive:
+            self._finalizer()
+            self._raise_write_error()
+    
+    def __enter__(self) -> "JSONLogger":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.finalize_session()
     
     def get_session_info(self) -> Dict[str, str]:
-        """Get current session information"""
+        """Get current session information (call flush() before reading jsonl_file)"""
         return {
             "session_id": self.session_id,
             "session_start": self.session_start,
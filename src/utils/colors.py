@@ -3,6 +3,9 @@ Terminal color utilities for NeuroCircuit
 Provides consistent color schemes across the system
 """
 
+import os
+import sys
+
 class Colors:
     """Terminal color codes for consistent styling"""
     
@@ -29,32 +32,51 @@ class Colors:
     BRIGHT_CYAN = '\033[96m'
     BRIGHT_WHITE = '\033[97m'
     
-    @classmethod
-    def colorize(cls, text: str, color: str) -> str:
+    # Fixed-color helpers format into prebuilt '%s' templates
+    _BOLD_TPL = BOLD + '%s' + RESET
+    _SUCCESS_TPL = BRIGHT_GREEN + '%s' + RESET
+    _ERROR_TPL = BRIGHT_RED + '%s' + RESET
+    _WARNING_TPL = BRIGHT_YELLOW + '%s' + RESET
+    _INFO_TPL = BRIGHT_CYAN + '%s' + RESET
+    
+    # Reset and templates are bound as defaults so calls skip class lookups
+    @staticmethod
+    def colorize(text: str, color: str, _reset: str = RESET) -> str:
         """Apply color to text with automatic reset"""
-        return f"{color}{text}{cls.RESET}"
+        return f"{color}{text}{_reset}"
     
-    @classmethod
-    def bold(cls, text: str) -> str:
+    @staticmethod
+    def bold(text: str, _tpl: str = _BOLD_TPL) -> str:
         """Make text bold"""
-        return f"{cls.BOLD}{text}{cls.RESET}"
+        return _tpl % (text,)
     
-    @classmethod
-    def success(cls, text: str) -> str:
+    @staticmethod
+    def success(text: str, _tpl: str = _SUCCESS_TPL) -> str:
         """Green success text"""
-        return cls.colorize(text, cls.BRIGHT_GREEN)
+        return _tpl % (text,)
     
-    @classmethod
-    def error(cls, text: str) -> str:
+    @staticmethod
+    def error(text: str, _tpl: str = _ERROR_TPL) -> str:
         """Red error text"""
-        return cls.colorize(text, cls.BRIGHT_RED)
+        return _tpl % (text,)
     
-    @classmethod
-    def warning(cls, text: str) -> str:
+    @staticmethod
+    def warning(text: str, _tpl: str = _WARNING_TPL) -> str:
         """Yellow warning text"""
-        return cls.colorize(text, cls.BRIGHT_YELLOW)
+        return _tpl % (text,)
     
-    @classmethod
-    def info(cls, text: str) -> str:
+    @staticmethod
+    def info(text: str, _tpl: str = _INFO_TPL) -> str:
         """Cyan info text"""
-        return cls.colorize(text, cls.BRIGHT_CYAN)
+        return _tpl % (text,)
+
+# Colorizing helpers become pass-through when stdout is not a terminal or NO_COLOR is set
+_ENABLED = sys.stdout is not None and sys.stdout.isatty() and os.environ.get('NO_COLOR') is None
+
+if not _ENABLED:
+    def _plain(text: str, *args, **kwargs) -> str:
+        """Return text without color codes"""
+        return text
+    
+    Colors.colorize = Colors.bold = staticmethod(_plain)
+    Colors.success = Colors.error = Colors.warning = Colors.info = staticmethod(_plain)
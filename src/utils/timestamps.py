@@ -0,0 +1,20 @@
+"""
+Timestamp utilities for NeuroCircuit
+Provides fast ISO-8601 timestamps for logging and snapshot hot paths
+"""
+
+import time
+
+# Most recently formatted epoch second and its "YYYY-MM-DDTHH:MM:SS" text
+_second_cache = (-1, "")
+
+def iso_now() -> str:
+    """Current local time as ISO-8601 with microseconds (datetime.now().isoformat() format)"""
+    global _second_cache
+    ns = time.time_ns()
+    second = ns // 1_000_000_000
+    cached_second, prefix = _second_cache
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+        _second_cache = (second, prefix)
+    return f"{prefix}.{(ns // 1000) % 1_000_000:06d}"